@@ -15,15 +15,27 @@ eth_top_monitor.py
 
 import os
 import time
-import json
+import asyncio
 import logging
+import re
+import signal
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
 
+import aiohttp
+import orjson
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from apscheduler.schedulers.blocking import BlockingScheduler
+
+try:
+    # libuv-based event loop; not available on Windows
+    import uvloop
+    _run_async = uvloop.run
+except ImportError:
+    _run_async = asyncio.run
 
 load_dotenv()
 
@@ -35,7 +47,17 @@ ETHERSCAN_API_KEY = os.getenv("ETHERSCAN_API_KEY", "").strip()
 BITQUERY_API_KEY = os.getenv("BITQUERY_API_KEY", "").strip()
 SNAPSHOT_FILE = os.getenv("SNAPSHOT_FILE", "top100_snapshot.json")
 SEND_FULL_EVERY = int(os.getenv("SEND_FULL_EVERY", "144"))
+SNAPSHOT_SAVE_EVERY = int(os.getenv("SNAPSHOT_SAVE_EVERY", "6"))
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+BALANCE_SCALE = 1_000_000  # snapshot balances are stored as integer micro-ETH
+BALANCE_CHANGE_DIVISOR = 10_000  # a balance counts as changed if it moved by more than 1/10000 (0.01%)
+TELEGRAM_MAX_LEN = 4000  # sendMessage hard limit is 4096 chars
+USER_AGENT = "Mozilla/5.0 (compatible; eth-top-monitor/1.0)"
+# aiohttp decodes br transparently when the Brotli package is installed
+ETHERSCAN_HEADERS = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip, deflate, br"}
+RETRY_TOTAL = 5
+RETRY_BACKOFF = 0.5
+RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
     raise SystemExit("Set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID in environment or .env")
@@ -43,7 +65,30 @@ if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
 logging.basicConfig(level=getattr(logging, LOG_LEVEL, logging.INFO), format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger("eth_top_monitor")
 
-@dataclass
+# shared keep-alive session: avoids a new TCP+TLS handshake per request
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": USER_AGENT})
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8))
+# the GraphQL query is read-only, so retrying its POST on 429/5xx is safe;
+# raise_on_status=False returns the last response once retries run out, so raise_for_status() still reports it
+SESSION.mount("https://graphql.bitquery.io/", HTTPAdapter(
+    max_retries=Retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, status_forcelist=RETRY_STATUSES,
+                      allowed_methods=frozenset({"POST"}), respect_retry_after_header=True, raise_on_status=False),
+))
+# sendMessage is only retried on 429: after a 5xx or a read timeout the message may already be delivered
+SESSION.mount("https://api.telegram.org/", HTTPAdapter(
+    max_retries=Retry(total=RETRY_TOTAL, read=0, backoff_factor=RETRY_BACKOFF, status_forcelist=(429,),
+                      allowed_methods=frozenset({"POST"}), respect_retry_after_header=True, raise_on_status=False),
+))
+
+ACCOUNTS_TABLE_SELECTOR = "table.table"
+_BAL_RE = re.compile(r"([\d,]+(?:\.\d+)?)")
+_PCT_RE = re.compile(r"([\d.]+)%?")
+
+# snapshot entry per address: (rank, balance in micro-ETH, balance_readable)
+HolderEntry = Tuple[int, int, str]
+
+@dataclass(slots=True)
 class Holder:
     rank: int
     address: str
@@ -54,116 +99,217 @@ class Holder:
 
 def send_telegram(text: str, parse_mode: str = "HTML"):
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-    resp = requests.post(url, json={
+    resp = SESSION.post(url, data=orjson.dumps({
         "chat_id": TELEGRAM_CHAT_ID,
         "text": text,
         "parse_mode": parse_mode,
         "disable_web_page_preview": True,
-    }, timeout=20)
+    }), headers={"Content-Type": "application/json"}, timeout=20)
     try:
         resp.raise_for_status()
         logger.debug("Telegram sent")
     except Exception:
         logger.error("Telegram send failed: %s %s", resp.status_code, resp.text if resp is not None else "no response")
 
+def send_lines(lines: List[str], parse_mode: str = "HTML"):
+    """Send lines in as few messages as possible, flushing on line boundaries before Telegram's limit."""
+    buf: List[str] = []
+    size = 0
+    for line in lines:
+        if buf and size + len(line) > TELEGRAM_MAX_LEN:
+            send_telegram("\n".join(buf), parse_mode)
+            buf.clear()
+            size = 0
+        buf.append(line)
+        size += len(line) + 1
+    if buf:
+        send_telegram("\n".join(buf), parse_mode)
+
 def load_snapshot() -> Dict[str, dict]:
     if not os.path.exists(SNAPSHOT_FILE):
         return {}
     try:
-        with open(SNAPSHOT_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(SNAPSHOT_FILE, "rb") as f:
+            snapshot = orjson.loads(f.read())
+        # snapshots written by older versions store {"rank", "balance_eth", "readable"} dicts
+        holders_map = snapshot.get("holders_map", {})
+        for addr, v in holders_map.items():
+            if isinstance(v, dict):
+                holders_map[addr] = (v["rank"], round(v["balance_eth"] * BALANCE_SCALE), v["readable"])
+        return snapshot
     except Exception as e:
         logger.exception("Failed to read snapshot file: %s", e)
         return {}
 
 def save_snapshot(snapshot: Dict[str, dict]):
     try:
-        with open(SNAPSHOT_FILE, "w", encoding="utf-8") as f:
-            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        # write to a temp file and rename so a crash never leaves a truncated snapshot
+        tmp = SNAPSHOT_FILE + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(snapshot, option=orjson.OPT_INDENT_2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, SNAPSHOT_FILE)
     except Exception as e:
         logger.exception("Failed to save snapshot file: %s", e)
 
+@lru_cache(maxsize=None)
+def _html_parser():
+    # imported on first use: runs that never reach HTML parsing skip loading selectolax
+    from selectolax.parser import HTMLParser
+    return HTMLParser
+
+def _is_accounts_table(table) -> bool:
+    headers = [th.text(strip=True).lower() for th in table.css("th")]
+    return any("rank" in h for h in headers) and any("address" in h for h in headers)
+
 def parse_etherscan_accounts_page(html: str) -> List[Holder]:
-    soup = BeautifulSoup(html, "html.parser")
-    # Find table that contains "Rank" or header "Address"
-    table = None
-    for t in soup.find_all("table"):
-        headers = [th.get_text(strip=True).lower() for th in t.find_all("th")]
-        if any("rank" in h for h in headers) and any("address" in h for h in headers):
-            table = t
-            break
-    if not table:
+    tree = _html_parser()(html)
+    # Etherscan's accounts list is its first "table.table"; only sniff every table if that misses
+    table = tree.css_first(ACCOUNTS_TABLE_SELECTOR)
+    if table is None or not _is_accounts_table(table):
+        # Find table that contains "Rank" or header "Address"
+        table = next((t for t in tree.css("table") if _is_accounts_table(t)), None)
+    if table is None:
         raise ValueError("Top accounts table not found on etherscan page")
     rows = []
-    for tr in table.find_all("tr"):
-        cols = tr.find_all(["td","th"])
+    # Etherscan renders rows in rank order; only sort if that ever stops being true
+    last_rank = 0
+    ordered = True
+    for tr in table.css("tr"):
+        cols = tr.css("td, th")
         if len(cols) < 3:
             continue
         try:
-            rank_text = cols[0].get_text(strip=True)
+            rank_text = cols[0].text(strip=True)
             rank_digits = ''.join(ch for ch in rank_text if ch.isdigit())
             if not rank_digits:
                 continue
             rank = int(rank_digits)
-            addr_el = cols[1].find("a")
-            address = addr_el.get_text(strip=True) if addr_el else cols[1].get_text(strip=True)
-            bal_text = cols[2].get_text(strip=True)
-            bal_num_str = bal_text.replace("ETH","").replace(",","").strip().split()[0]
-            bal_num = float(bal_num_str)
+            if rank < last_rank:
+                ordered = False
+            else:
+                last_rank = rank
+            addr_el = cols[1].css_first("a")
+            address = addr_el.text(strip=True) if addr_el is not None else cols[1].text(strip=True)
+            bal_text = cols[2].text(strip=True)
+            m = _BAL_RE.search(bal_text)
+            if not m:
+                continue
+            bal_num = float(m.group(1).replace(",", ""))
             percent = None
             if len(cols) >= 4:
-                pct_text = cols[3].get_text(strip=True).replace("%","").replace(",","")
+                m = _PCT_RE.search(cols[3].text(strip=True))
                 try:
-                    percent = float(pct_text)
-                except Exception:
+                    percent = float(m.group(1)) if m else None
+                except ValueError:
                     percent = None
             rows.append(Holder(rank=rank, address=address, balance_eth=bal_num, balance_readable=bal_text, percent_of_total=percent))
         except Exception:
             continue
-    rows_sorted = sorted(rows, key=lambda h: h.rank)[:100]
-    return rows_sorted
+    if ordered:
+        return rows[:100]
+    return sorted(rows, key=lambda h: h.rank)[:100]
 
-def fetch_top_from_etherscan(pages_needed: int = 4) -> List[Holder]:
-    session = requests.Session()
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; eth-top-monitor/1.0)"
-    }
-    holders: List[Holder] = []
-    per_page = 25
-    page = 1
-    while len(holders) < 100 and page <= pages_needed:
-        try_urls = [
-            f"https://etherscan.io/accounts/{ (page-1)*per_page }",
-            f"https://etherscan.io/accounts?page={page}",
-            f"https://etherscan.io/accounts/c?page={page}",
-        ]
-        page_html = None
+async def _etherscan_get(session: aiohttp.ClientSession, url: str, etag: Optional[str] = None) -> Tuple[int, str, Optional[str]]:
+    """GET url, backing off on 429/5xx and honouring Retry-After when the server sends it.
+
+    Returns (status, body, ETag); with etag set the request is conditional and may come back 304.
+    """
+    headers = {"If-None-Match": etag} if etag else None
+    for attempt in range(RETRY_TOTAL + 1):
+        async with session.get(url, headers=headers) as r:
+            if r.status not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                return r.status, await r.text(), r.headers.get("ETag")
+            retry_after = r.headers.get("Retry-After", "")
+        delay = min(float(retry_after), 60.0) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+        logger.debug("Etherscan answered %s for %s, retrying in %.1fs", r.status, url, delay)
+        await asyncio.sleep(delay)
+
+async def _fetch_etherscan_page(session: aiohttp.ClientSession, sem: asyncio.Semaphore, page: int, per_page: int,
+                                known_etags: Dict[str, str]) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Return (url, etag, html) for the page; html is None if Etherscan answered 304 Not Modified for url."""
+    try_urls = [
+        f"https://etherscan.io/accounts/{ (page-1)*per_page }",
+        f"https://etherscan.io/accounts?page={page}",
+        f"https://etherscan.io/accounts/c?page={page}",
+    ]
+    async with sem:
         for u in try_urls:
             logger.debug("Requesting %s", u)
             try:
-                r = session.get(u, headers=headers, timeout=20)
-                if r.status_code == 200 and ("Top Accounts" in r.text or "accounts list" in r.text.lower()):
-                    page_html = r.text
-                    break
+                status, text, etag = await _etherscan_get(session, u, known_etags.get(u))
+                if status == 304 and u in known_etags:
+                    logger.debug("Not modified: %s", u)
+                    return u, known_etags[u], None
+                if status == 200 and ("Top Accounts" in text or "accounts list" in text.lower()):
+                    return u, etag, text
             except Exception:
                 continue
-        if not page_html:
-            r = session.get("https://etherscan.io/accounts", headers=headers, timeout=20)
-            page_html = r.text
-        parsed = parse_etherscan_accounts_page(page_html)
+        # the generic fallback page is not tied to a page number, so it is never cached
+        _, text, _ = await _etherscan_get(session, "https://etherscan.io/accounts")
+        return None, None, text
+
+def _holder_from_row(address: str, rank: int, entry: HolderEntry) -> Holder:
+    # rank comes from the cached page row: the previous map may have placed this address on another page
+    return Holder(rank=rank, address=address, balance_eth=entry[1] / BALANCE_SCALE, balance_readable=entry[2])
+
+async def fetch_top_from_etherscan_async(pages_needed: int = 4, previous: Optional[Dict[str, HolderEntry]] = None,
+                                         page_cache: Optional[Dict[str, dict]] = None) -> Tuple[List[Holder], Dict[str, dict]]:
+    per_page = 25
+    previous = previous or {}
+    page_cache = page_cache or {}
+    # only ask for 304 on pages that can be fully rebuilt from the previous snapshot
+    known_etags = {
+        url: entry["etag"] for url, entry in page_cache.items()
+        if isinstance(entry, dict) and entry.get("etag") and entry.get("rows")
+        and all(isinstance(row, list) and len(row) == 2 and row[0] in previous for row in entry["rows"])
+    }
+    connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=20)
+    # at most 2 requests in flight to stay under Etherscan's rate limit
+    sem = asyncio.Semaphore(2)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=ETHERSCAN_HEADERS) as session:
+        pages = await asyncio.gather(*[
+            _fetch_etherscan_page(session, sem, page, per_page, known_etags) for page in range(1, pages_needed + 1)
+        ])
+    holders: List[Holder] = []
+    seen = set()
+    new_cache: Dict[str, dict] = {}
+    for url, etag, page_html in pages:
+        if page_html is None:
+            rows = page_cache[url]["rows"]
+            parsed = [_holder_from_row(addr, rank, previous[addr]) for addr, rank in rows]
+        else:
+            parsed = parse_etherscan_accounts_page(page_html)
+            rows = [[h.address.lower(), h.rank] for h in parsed]
+        # cache the whole page, not just what survived dedup: pages go stale independently of each other
+        if url and etag and rows:
+            new_cache[url] = {"etag": etag, "rows": rows}
         for h in parsed:
             if len(holders) >= 100:
                 break
-            if not any(other.address == h.address for other in holders):
-                holders.append(h)
-        page += 1
-        time.sleep(1.0)
-    return holders[:100]
+            key = h.address.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+            holders.append(h)
+    return holders[:100], new_cache
+
+def fetch_top_from_etherscan(pages_needed: int = 4, previous: Optional[Dict[str, HolderEntry]] = None,
+                             page_cache: Optional[Dict[str, dict]] = None) -> Tuple[List[Holder], Dict[str, dict]]:
+    """Scrape the top-100 from Etherscan.
+
+    page_cache maps page URL -> {"etag", "rows": [[address, rank], ...]} from the previous run. Pages whose
+    addresses are all in previous are requested with If-None-Match; on 304 they are rebuilt from the cached
+    ranks plus balances from previous. Returns the holders and the page cache for this run.
+    """
+    return _run_async(fetch_top_from_etherscan_async(pages_needed, previous, page_cache))
 
 def fetch_top_with_bitquery(limit: int = 100) -> List[Holder]:
     if not BITQUERY_API_KEY:
         raise ValueError("No BITQUERY_API_KEY configured")
-    url = "https://graphql.bitquery.io"
+    url = "https://graphql.bitquery.io/"
     query = """
     query ($network: String!, $limit: Int!) {
       ethereum(network: $network) {
@@ -177,9 +323,9 @@ def fetch_top_with_bitquery(limit: int = 100) -> List[Holder]:
     """
     variables = {"network": "ethereum", "limit": limit}
     headers = {"X-API-KEY": BITQUERY_API_KEY, "Content-Type": "application/json"}
-    r = requests.post(url, json={"query": query, "variables": variables}, headers=headers, timeout=30)
+    r = SESSION.post(url, data=orjson.dumps({"query": query, "variables": variables}), headers=headers, timeout=30)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
     out = []
     for i, item in enumerate(data.get("data", {}).get("ethereum", {}).get("balances", []), start=1):
         addr = item.get("address", {}).get("address")
@@ -187,37 +333,50 @@ def fetch_top_with_bitquery(limit: int = 100) -> List[Holder]:
         out.append(Holder(rank=i, address=addr, balance_eth=bal, balance_readable=str(bal) + " ETH"))
     return out
 
-def holders_to_map(holders: List[Holder]) -> Dict[str, dict]:
-    return {h.address.lower(): {"rank": h.rank, "balance_eth": h.balance_eth, "readable": h.balance_readable} for h in holders}
+def holders_to_map(holders: List[Holder]) -> Dict[str, HolderEntry]:
+    return {h.address.lower(): (h.rank, round(h.balance_eth * BALANCE_SCALE), h.balance_readable) for h in holders}
 
-def compare_snapshots(old: Dict[str, dict], new: Dict[str, dict]):
+def compare_snapshots(old: Dict[str, HolderEntry], new: Dict[str, HolderEntry]):
+    # dict key views already behave as sets, no need to copy them
+    old_keys = old.keys()
+    new_keys = new.keys()
     rank_changes = []
-    new_entries = []
-    removed = []
-    old_addrs = set(old.keys())
-    new_addrs = set(new.keys())
-    for addr in new_addrs & old_addrs:
-        old_rank = old[addr]["rank"]
-        new_rank = new[addr]["rank"]
+    for addr in new_keys & old_keys:
+        old_rank = old[addr][0]
+        new_rank = new[addr][0]
         if old_rank != new_rank:
             rank_changes.append((addr, old_rank, new_rank))
-    for addr in new_addrs - old_addrs:
-        new_entries.append((addr, new[addr]["rank"]))
-    for addr in old_addrs - new_addrs:
-        removed.append((addr, old[addr]["rank"]))
+    new_entries = [(addr, new[addr][0]) for addr in new_keys - old_keys]
+    removed = [(addr, old[addr][0]) for addr in old_keys - new_keys]
     return rank_changes, new_entries, removed
 
+def balances_changed(old: Dict[str, HolderEntry], new: Dict[str, HolderEntry]) -> bool:
+    for addr in new.keys() & old.keys():
+        old_bal = old[addr][1]
+        if abs(new[addr][1] - old_bal) * BALANCE_CHANGE_DIVISOR > abs(old_bal):
+            return True
+    return False
+
+_HOLDER_LINE = "<b>{rank:3d}.</b> <code>{address}</code> — {readable}"
+_HOLDER_LINE_LABELED = _HOLDER_LINE + " — {label}"
+
 def format_holder_line(rank: int, address: str, readable: str, label: Optional[str]=None) -> str:
-    lbl = f" — {label}" if label else ""
-    return f"<b>{rank:3d}.</b> <code>{address}</code> — {readable}{lbl}"
+    return (_HOLDER_LINE_LABELED if label else _HOLDER_LINE).format(rank=rank, address=address, readable=readable, label=label)
 
 def job(state: dict):
     try:
+        old_snapshot = load_snapshot()
+        old_map = old_snapshot.get("holders_map", {})
+        old_pages = old_snapshot.get("pages", {})
+        # the page cache describes Etherscan pages, so it is dropped whenever the holders come from Bitquery
+        pages: Dict[str, dict] = {}
+
         logger.info("Fetching top holders from Etherscan...")
         try:
-            holders = fetch_top_from_etherscan()
+            holders, etherscan_pages = fetch_top_from_etherscan(previous=old_map, page_cache=old_pages)
             if not holders or len(holders) < 10:
                 raise ValueError("Etherscan returned suspiciously few holders")
+            pages = etherscan_pages
         except Exception as e:
             logger.warning("Etherscan fetch failed: %s", e)
             if BITQUERY_API_KEY:
@@ -227,65 +386,70 @@ def job(state: dict):
                 raise
 
         new_map = holders_to_map(holders)
-        old_snapshot = load_snapshot()
-        old_map = old_snapshot.get("holders_map", {})
 
         rank_changes, new_entries, removed = compare_snapshots(old_map, new_map)
 
-        messages = []
+        lines: List[str] = []
         if rank_changes or new_entries or removed:
-            header = f"🔔 <b>Top-100 ETH list changed</b>\n"
-            messages.append(header)
+            lines.append("🔔 <b>Top-100 ETH list changed</b>\n")
             if new_entries:
-                messages.append("<b>➕ New in top-100:</b>")
+                lines.append("<b>➕ New in top-100:</b>")
                 for addr, rnk in sorted(new_entries, key=lambda x: x[1]):
-                    messages.append(f"{rnk:3d}. <code>{addr}</code>")
+                    lines.append(f"{rnk:3d}. <code>{addr}</code>")
             if removed:
-                messages.append("\n<b>➖ Removed from top-100:</b>")
+                lines.append("\n<b>➖ Removed from top-100:</b>")
                 for addr, orank in sorted(removed, key=lambda x: x[1]):
-                    messages.append(f"{orank:3d}. <code>{addr}</code>")
+                    lines.append(f"{orank:3d}. <code>{addr}</code>")
             if rank_changes:
-                messages.append("\n<b>🔀 Rank changes:</b>")
+                lines.append("\n<b>🔀 Rank changes:</b>")
                 for addr, orank, nrank in sorted(rank_changes, key=lambda x: (x[1]-x[2])):
                     delta = nrank - orank
                     arrow = "↑" if delta < 0 else "↓"
-                    messages.append(f"{nrank:3d}. <code>{addr}</code> {arrow} ({orank} → {nrank})")
-
-            full_text = "\n".join(messages)
-            if len(full_text) > 3800:
-                chunks = [full_text[i:i+3500] for i in range(0, len(full_text), 3500)]
-                for ch in chunks:
-                    send_telegram(ch)
-            else:
-                send_telegram(full_text)
+                    lines.append(f"{nrank:3d}. <code>{addr}</code> {arrow} ({orank} → {nrank})")
         else:
             logger.info("No changes in top-100")
 
         state["polls_done"] = state.get("polls_done", 0) + 1
         if SEND_FULL_EVERY > 0 and state["polls_done"] % SEND_FULL_EVERY == 0:
-            header = "<b>📋 Top 100 ETH holders (snapshot)</b>\n"
-            lines = [header]
+            if lines:
+                lines.append("")
+            lines.append("<b>📋 Top 100 ETH holders (snapshot)</b>\n")
             for h in holders:
                 lines.append(format_holder_line(h.rank, h.address, h.balance_readable, h.label))
-            text = "\n".join(lines)
-            for i in range(0, len(text), 3800):
-                send_telegram(text[i:i+3800])
 
-        snapshot = {"timestamp": int(time.time()), "holders_map": new_map}
-        save_snapshot(snapshot)
+        if lines:
+            send_lines(lines)
+
+        # skip the disk write in steady state, but still refresh the timestamp every SNAPSHOT_SAVE_EVERY polls
+        unchanged = not (rank_changes or new_entries or removed) and not balances_changed(old_map, new_map)
+        state["polls_since_save"] = state.get("polls_since_save", 0) + 1
+        if not unchanged or pages != old_pages or state["polls_since_save"] >= SNAPSHOT_SAVE_EVERY:
+            snapshot = {"timestamp": int(time.time()), "holders_map": new_map, "pages": pages}
+            save_snapshot(snapshot)
+            state["polls_since_save"] = 0
+        else:
+            logger.debug("Snapshot unchanged, skipping write")
 
     except Exception as e:
         logger.exception("Job failed: %s", e)
         send_telegram(f"⚠️ <b>eth_top_monitor error</b>\n{str(e)}")
 
+def _handle_sigterm(signum, frame):
+    raise SystemExit(0)
+
 def main():
     state = {"polls_done": 0}
-    scheduler = BlockingScheduler()
-    job(state)
-    scheduler.add_job(lambda: job(state), 'interval', seconds=POLL_INTERVAL, max_instances=1)
+    # stop on SIGTERM (systemd, docker stop) the same way as on Ctrl+C
+    signal.signal(signal.SIGTERM, _handle_sigterm)
+    logger.info("Polling every %s seconds", POLL_INTERVAL)
     try:
-        logger.info("Scheduler start, polling every %s seconds", POLL_INTERVAL)
-        scheduler.start()
+        while True:
+            started = time.monotonic()
+            try:
+                job(state)
+            except Exception:
+                logger.exception("Unhandled error in job")
+            time.sleep(max(0.0, POLL_INTERVAL - (time.monotonic() - started)))
     except (KeyboardInterrupt, SystemExit):
         logger.info("Stopping...")
 